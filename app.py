@@ -1,29 +1,217 @@
 import os
 import io
-import json
 import zipfile
+import orjson
 import requests
 import math
+import re
 import time
+import random
 import secrets
+import shutil
+import tempfile
+import queue
 import threading
+import multiprocessing
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict
 from functools import wraps
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from flask import Flask, render_template, jsonify, request, send_file, session, redirect, url_for, Response
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
-from pypdf import PdfReader, PdfWriter
+from requests.adapters import HTTPAdapter
+import pikepdf
 
 __version__ = '1.2.0'
 
 load_dotenv()
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that uses orjson for plain dumps/loads and responses.
+
+    Calls passing options (such as the session serializer's object_hook)
+    go to the default stdlib-based provider, which honours them.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Skip the str round trip; orjson already produces UTF-8 bytes
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+            mimetype='application/json'
+        )
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.getenv('SECRET_KEY', secrets.token_hex(32))
 
 ASHBY_API_KEY = os.getenv('ASHBY_API_KEY')
 ASHBY_BASE_URL = 'https://api.ashbyhq.com'
 APP_PASSKEY = os.getenv('APP_PASSKEY', 'changeme')
 
+# Shared read-only default for optional nested objects in Ashby responses
+_EMPTY = {}
+
+ASHBY_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json'
+}
+
+# Concurrent candidate.info lookups in /api/candidates, shared by all
+# requests, and how many one request may have queued at a time
+RESUME_FETCH_WORKERS = 20
+RESUME_LOOKUP_WINDOW = RESUME_FETCH_WORKERS
+
+# Asks application.list to inline each candidate's resume handle, saving a
+# candidate.info round trip per candidate
+APPLICATION_LIST_EXPAND = ['candidate.resumeFileHandle']
+# Optional application.list parameters Ashby has rejected at runtime
+_unsupported_application_params = set()
+
+# Parallel file.info lookups and downloads in /api/download-bulk
+FILE_INFO_WORKERS = 8
+BULK_DOWNLOAD_WORKERS = 16
+# How far ahead of the ZIP writer resumes are fetched
+BULK_DOWNLOAD_WINDOW = 2 * BULK_DOWNLOAD_WORKERS
+
+# Response cache lifetimes for slow-changing Ashby data, in seconds. When
+# Ashby errors, the last cached response is served as stale instead.
+JOB_LIST_CACHE_TTL = 60
+ASHBY_CACHE_TTLS = {
+    'job.info': 300,
+    'interviewStage.list': 300,
+    'candidate.info': 30
+}
+
+# Runs of characters not allowed in filenames; \w is Unicode-aware (any
+# alphanumeric plus underscore), so accented names survive
+_FILENAME_UNSAFE = re.compile(r'[^\w -]+')
+
+# Bulk downloads are copied in chunks; resumes larger than the spool size
+# are buffered on disk rather than in memory
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_SPOOL_SIZE = 1024 * 1024
+# (connect, read) timeouts for presigned file URLs, in seconds; the read
+# timeout applies to every chunk, so a stalled connection can't hold a
+# shared download worker forever
+DOWNLOAD_TIMEOUT = (10, 60)
+
+# file.info results are cached for less time than the presigned URLs they
+# contain stay valid; an entry is also dropped if its URL is rejected
+FILE_INFO_TTL = 60
+
+# Retry backoff for ashby_request, in seconds
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 60
+
+# Datasets kept for incremental (syncToken) list syncs, least recently used
+# dropped first. Kept in memory alongside their tokens so the two can't
+# drift apart across restarts or between gunicorn workers.
+SYNC_STATE_MAXSIZE = 64
+_sync_states = OrderedDict()
+_sync_lock = threading.Lock()
+
+# Finished /api/candidates listings, keyed by (job id, stage id), so
+# re-opening a stage shortly after skips the whole pipeline
+CANDIDATE_LISTING_TTL = 30
+CANDIDATE_LISTING_MAXSIZE = 256
+_candidate_listings = OrderedDict()
+_candidate_listings_lock = threading.Lock()
+
+# Pacing for every Ashby request: at most ASHBY_RATE_MAX requests per
+# second after a burst of ASHBY_RATE_CAPACITY, adapting downwards on 429s.
+# The limit is per process, so each gunicorn worker gets its own budget.
+ASHBY_RATE_CAPACITY = 10
+ASHBY_RATE_MAX = 10
+
+# Connections per host kept alive by each worker thread's own session
+WORKER_POOL_MAXSIZE = 4
+
+# Background /api/combine-pdfs jobs. Their status and results live on disk,
+# readable only by the app's user, so any gunicorn worker can answer a poll; jobs whose directory hasn't been
+# touched for COMBINE_JOB_TTL seconds are removed. Jobs wait as 'queued'
+# until a job process picks them up; a running job touches its status every
+# COMBINE_JOB_HEARTBEAT seconds, and one that stops doing so for
+# COMBINE_JOB_STALL_TIMEOUT seconds is reported as failed, since its process
+# has most likely died.
+COMBINE_JOBS_DIR = os.getenv('COMBINE_JOBS_DIR') or os.path.join(tempfile.gettempdir(), 'combine-pdf-jobs')
+# Job processes per gunicorn worker, so at most WEB_CONCURRENCY of them run
+# on the host; each merges its groups inline
+COMBINE_JOB_WORKERS = 1
+COMBINE_JOB_TTL = 3600
+COMBINE_JOB_HEARTBEAT = 30
+COMBINE_JOB_STALL_TIMEOUT = 600
+_COMBINE_JOB_ID = re.compile(r'[A-Za-z0-9_-]{22}')
+
+
+def new_http_session(pool_maxsize):
+    """Create a session whose connections to Ashby and file storage are kept alive.
+
+    Auth is passed per Ashby call rather than set on the session, since the
+    presigned file URLs must not receive it.
+    """
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=pool_maxsize, max_retries=0)
+    http.mount('http://', adapter)
+    http.mount('https://', adapter)
+    return http
+
+
+# Shared by request threads; pool workers get one each (see http_session)
+SESSION = new_http_session(pool_maxsize=50)
+_thread_local = threading.local()
+
+
+def init_worker_session():
+    """ThreadPoolExecutor initializer giving the worker thread its own session."""
+    _thread_local.session = new_http_session(pool_maxsize=WORKER_POOL_MAXSIZE)
+
+
+def http_session():
+    """Return the calling thread's session, so fan-out workers don't contend
+    on the shared connection pool's lock."""
+    return getattr(_thread_local, 'session', SESSION)
+
+
+# Long-lived worker pools, so the workers' sessions (and their kept-alive
+# connections) outlast any single request
+RESUME_LOOKUP_POOL = ThreadPoolExecutor(
+    max_workers=RESUME_FETCH_WORKERS,
+    thread_name_prefix='resume-lookup',
+    initializer=init_worker_session
+)
+FILE_INFO_POOL = ThreadPoolExecutor(
+    max_workers=FILE_INFO_WORKERS,
+    thread_name_prefix='file-info',
+    initializer=init_worker_session
+)
+BULK_DOWNLOAD_POOL = ThreadPoolExecutor(
+    max_workers=BULK_DOWNLOAD_WORKERS,
+    thread_name_prefix='bulk-download',
+    initializer=init_worker_session
+)
+# Runs whole combine jobs in separate processes, so extracting, merging and
+# zipping never block the web worker (a gevent worker's threads are
+# greenlets sharing its one OS thread). Replaced if a job process dies.
+_combine_job_pool = None
+_combine_job_pool_lock = threading.Lock()
+
 
 def login_required(f):
     """Decorator to require authentication."""
@@ -37,83 +225,353 @@ def login_required(f):
     return decorated_function
 
 
+class ZipStreamBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink for streaming a ZipFile.
+
+    zipfile falls back to data descriptors when its file can't seek, so the
+    archive can be handed to the client piece by piece via drain().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        """Return and discard everything written since the last drain."""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class TokenBucket:
+    """Thread-safe token bucket with AIMD-adjusted refill rate.
+
+    acquire() only sleeps once the bucket is empty. The refill rate is halved
+    once per throttling event and creeps back up by `increase_step` after
+    `increase_after` consecutive successes, up to `max_rate`. Throttled
+    responses arriving within `decrease_interval` seconds (or the
+    Retry-After) of the last halving belong to the same event, so workers
+    hitting one 429 together only halve the rate once.
+    """
+
+    def __init__(self, capacity, max_rate, min_rate=0.5, increase_step=0.5, increase_after=10,
+                 decrease_interval=1.0):
+        self.capacity = capacity
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase_step = increase_step
+        self.increase_after = increase_after
+        self.decrease_interval = decrease_interval
+        self.refill_rate = max_rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._successes = 0
+        self._hold_until = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.refill_rate
+            time.sleep(wait)
+
+    def on_throttled(self, retry_after=0):
+        """Multiplicative decrease after a rate-limited response."""
+        with self._lock:
+            self._successes = 0
+            now = time.monotonic()
+            if now < self._hold_until:
+                return
+            self._refill()
+            self.refill_rate = max(self.min_rate, self.refill_rate / 2)
+            self._hold_until = now + max(self.decrease_interval, retry_after)
+
+    def on_success(self):
+        """Additive increase after enough consecutive successful responses."""
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.increase_after:
+                self._refill()
+                self.refill_rate = min(self.max_rate, self.refill_rate + self.increase_step)
+                self._successes = 0
+
+
+ASHBY_RATE_LIMITER = TokenBucket(capacity=ASHBY_RATE_CAPACITY, max_rate=ASHBY_RATE_MAX)
+
+
+def ttl_cache(ttl, maxsize=128, cache_if=None, stale_on_error=False):
+    """Decorator caching results per positional args for `ttl` seconds.
+
+    Entries are evicted least-recently-used once `maxsize` is reached. When
+    `cache_if` is given, only results for which it returns True are stored.
+    With `stale_on_error`, a result that isn't cacheable is replaced by the
+    last cached one for the same args, even if expired, marked 'stale' (the
+    wrapped function must return Ashby-style result dicts).
+    The wrapper exposes `cache_clear()` and `cache_pop(*args)`.
+    """
+    def decorator(f):
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(f)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(args)
+                if entry and entry[0] > now:
+                    cache.move_to_end(args)
+                    return entry[1]
+
+            result = f(*args)
+
+            if cache_if is None or cache_if(result):
+                with lock:
+                    cache[args] = (now + ttl, result)
+                    cache.move_to_end(args)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            elif stale_on_error and entry:
+                print(f"Serving stale {f.__name__}{args} after error: {result.get('errors')}")
+                return {**entry[1], 'stale': True}
+            return result
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        def cache_pop(*args):
+            with lock:
+                cache.pop(args, None)
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_pop = cache_pop
+        return wrapper
+    return decorator
+
+
+def succeeded(result):
+    """Whether an Ashby result dict reports success (for ttl_cache's cache_if)."""
+    return bool(result.get('success'))
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return 0
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+def retry_delay(attempt, retry_after=0):
+    """Exponential backoff with jitter, capped at RETRY_MAX_DELAY.
+
+    Below the cap the delay is never shorter than Retry-After, and the
+    jitter is added on top of it too, so concurrent workers told to wait the
+    same time after a shared 429 don't retry in lockstep. A longer
+    Retry-After is cut down to the cap.
+    """
+    floor = max(RETRY_BASE_DELAY * 2 ** attempt, retry_after)
+    return min(floor * random.uniform(1, 1.5), RETRY_MAX_DELAY)
+
+
 def ashby_request(endpoint, data=None, retries=3):
-    """Make an authenticated request to the Ashby API with retry logic."""
+    """Make an authenticated request to the Ashby API with retry logic.
+
+    Errors that retrying didn't get past, as opposed to ones Ashby itself
+    returned, come back marked 'transient'.
+    """
     url = f"{ASHBY_BASE_URL}/{endpoint}"
-    headers = {
-        'Content-Type': 'application/json',
-        'Accept': 'application/json'
-    }
 
     for attempt in range(retries):
+        # Every attempt counts against Ashby's limit, whichever thread or
+        # caller makes it
+        ASHBY_RATE_LIMITER.acquire()
         try:
-            response = requests.post(
+            response = http_session().post(
                 url,
                 json=data or {},
                 auth=(ASHBY_API_KEY, ''),
-                headers=headers,
+                headers=ASHBY_HEADERS,
                 timeout=30
             )
 
             # Check for rate limiting
             if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', 5))
-                print(f"Rate limited. Waiting {retry_after} seconds...")
-                time.sleep(retry_after)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                ASHBY_RATE_LIMITER.on_throttled(retry_after)
+                if attempt == retries - 1:
+                    # Don't hold a shared worker just to report the error
+                    return {'success': False, 'errors': 'Rate limited by API', 'transient': True}
+                delay = retry_delay(attempt, retry_after)
+                print(f"Rate limited. Waiting {delay:.1f} seconds...")
+                time.sleep(delay)
                 continue
 
+            # Retry server errors; the provider may recover quickly
+            if response.status_code >= 500:
+                if attempt < retries - 1:
+                    delay = retry_delay(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                    print(f"Server error {response.status_code}, retrying in {delay:.1f} seconds... (attempt {attempt + 1})")
+                    time.sleep(delay)
+                    continue
+                return {'success': False, 'errors': f'Server error from API ({response.status_code})', 'transient': True}
+
             # Check for empty response
             if not response.text:
                 if attempt < retries - 1:
-                    print(f"Empty response, retrying in 2 seconds... (attempt {attempt + 1})")
-                    time.sleep(2)
+                    delay = retry_delay(attempt)
+                    print(f"Empty response, retrying in {delay:.1f} seconds... (attempt {attempt + 1})")
+                    time.sleep(delay)
                     continue
-                return {'success': False, 'errors': 'Empty response from API'}
+                return {'success': False, 'errors': 'Empty response from API', 'transient': True}
 
+            if response.ok:
+                ASHBY_RATE_LIMITER.on_success()
             return response.json()
 
         except requests.exceptions.JSONDecodeError:
             if attempt < retries - 1:
-                print(f"JSON decode error, retrying in 2 seconds... (attempt {attempt + 1})")
-                time.sleep(2)
+                delay = retry_delay(attempt)
+                print(f"JSON decode error, retrying in {delay:.1f} seconds... (attempt {attempt + 1})")
+                time.sleep(delay)
                 continue
-            return {'success': False, 'errors': 'Invalid JSON response from API'}
+            return {'success': False, 'errors': 'Invalid JSON response from API', 'transient': True}
 
         except requests.exceptions.RequestException as e:
             if attempt < retries - 1:
-                print(f"Request error: {e}, retrying in 2 seconds... (attempt {attempt + 1})")
-                time.sleep(2)
+                delay = retry_delay(attempt)
+                print(f"Request error: {e}, retrying in {delay:.1f} seconds... (attempt {attempt + 1})")
+                time.sleep(delay)
                 continue
-            return {'success': False, 'errors': f'Request failed: {str(e)}'}
+            return {'success': False, 'errors': f'Request failed: {str(e)}', 'transient': True}
 
-    return {'success': False, 'errors': 'Max retries exceeded'}
+    return {'success': False, 'errors': 'Max retries exceeded', 'transient': True}
 
 
-def ashby_request_paginated(endpoint, data=None):
-    """Make paginated requests to the Ashby API and return all results."""
-    all_results = []
+def _make_cached_endpoint(endpoint, ttl):
+    @ttl_cache(ttl=ttl, maxsize=1024, cache_if=succeeded, stale_on_error=True)
+    def request_endpoint(payload):
+        return ashby_request(endpoint, orjson.loads(payload))
+    request_endpoint.__name__ = endpoint
+    return request_endpoint
+
+
+_cached_endpoints = {endpoint: _make_cached_endpoint(endpoint, ttl)
+                     for endpoint, ttl in ASHBY_CACHE_TTLS.items()}
+
+
+def cached_ashby_request(endpoint, data=None):
+    """ashby_request with a response cache for slow-changing endpoints.
+
+    Responses are cached per endpoint and payload for ASHBY_CACHE_TTLS
+    seconds. If Ashby fails, the last good response is served instead,
+    marked 'stale'.
+    """
+    payload = orjson.dumps(data or {}, option=orjson.OPT_SORT_KEYS)
+    return _cached_endpoints[endpoint](payload)
+
+
+def _clear_cached_endpoints():
+    for request_endpoint in _cached_endpoints.values():
+        request_endpoint.cache_clear()
+
+
+cached_ashby_request.cache_clear = _clear_cached_endpoints
+
+
+def iter_pages(endpoint, data=None, sync_token=None):
+    """Yield each page Ashby returns for a paginated endpoint, in order.
+
+    The first request carries sync_token, if given, and later ones the
+    cursor from the previous page. Iteration stops after the last page, or
+    after a failed response, which is yielded as-is.
+    """
     cursor = None
 
     while True:
         request_data = data.copy() if data else {}
         if cursor:
             request_data['cursor'] = cursor
+        elif sync_token:
+            request_data['syncToken'] = sync_token
 
         result = ashby_request(endpoint, request_data)
+        yield result
+
+        # Check if there's more data
+        if not (result.get('success') and result.get('moreDataAvailable') and result.get('nextCursor')):
+            return
+        cursor = result['nextCursor']
+
+
+def ashby_request_paginated(endpoint, data=None, incremental=False):
+    """Make paginated requests to the Ashby API and return all results.
+
+    With incremental=True the results are also kept in memory together with
+    the syncToken Ashby returns, and later calls with the same endpoint and
+    data only fetch records changed since then, merging them in by id.
+    Merged records are never removed, so only use it for unfiltered
+    listings, where a record can't move out of the result set.
+    """
+    sync_key = (endpoint, orjson.dumps(data or {}, option=orjson.OPT_SORT_KEYS)) if incremental else None
+    with _sync_lock:
+        sync_state = _sync_states.get(sync_key) if incremental else None
 
+    all_results = []
+
+    for result in iter_pages(endpoint, data, sync_state['syncToken'] if sync_state else None):
         if not result.get('success'):
+            if sync_state:
+                # The sync token may have expired; fall back to a full sync
+                print(f"Incremental sync of {endpoint} failed, doing a full sync")
+                with _sync_lock:
+                    _sync_states.pop(sync_key, None)
+                return ashby_request_paginated(endpoint, data, incremental)
             return result  # Return error response
 
         all_results.extend(result.get('results', []))
 
-        # Check if there's more data
-        if result.get('moreDataAvailable') and result.get('nextCursor'):
-            cursor = result['nextCursor']
-            time.sleep(0.2)  # Small delay between pages to avoid rate limiting
-        else:
-            break
+    if not incremental:
+        return {'success': True, 'results': all_results}
 
-    return {'success': True, 'results': all_results}
+    records = dict(sync_state['records']) if sync_state else {}
+    for record in all_results:
+        records[record.get('id')] = record
+
+    if result.get('syncToken'):
+        with _sync_lock:
+            _sync_states[sync_key] = {'syncToken': result['syncToken'], 'records': records}
+            _sync_states.move_to_end(sync_key)
+            while len(_sync_states) > SYNC_STATE_MAXSIZE:
+                _sync_states.popitem(last=False)
+
+    return {'success': True, 'results': list(records.values())}
 
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -143,68 +601,168 @@ def index():
     return render_template('index.html')
 
 
-@app.route('/api/jobs')
-@login_required
-def get_jobs():
-    """Get all jobs from Ashby."""
-    result = ashby_request_paginated('job.list')
-    if result.get('success'):
-        jobs = result.get('results', [])
-        # Return simplified job data
-        return jsonify([{
-            'id': job.get('id'),
-            'title': job.get('title'),
-            'status': job.get('status'),
-            'departmentName': job.get('department', {}).get('name', 'N/A') if job.get('department') else 'N/A',
-            'locationName': job.get('location', {}).get('name', 'N/A') if job.get('location') else 'N/A'
-        } for job in jobs])
-    return jsonify({'error': result.get('errors', 'Unknown error')}), 400
+@ttl_cache(ttl=JOB_LIST_CACHE_TTL, cache_if=succeeded, stale_on_error=True)
+def list_jobs():
+    """Fetch all jobs from Ashby as simplified dicts, cached briefly."""
+    result = ashby_request_paginated('job.list', incremental=True)
+    if not result.get('success'):
+        return result
 
+    return {'success': True, 'results': [{
+        'id': job.get('id'),
+        'title': job.get('title'),
+        'status': job.get('status'),
+        'departmentName': (job.get('department') or _EMPTY).get('name', 'N/A'),
+        'locationName': (job.get('location') or _EMPTY).get('name', 'N/A')
+    } for job in result.get('results', [])]}
 
-@app.route('/api/jobs/<job_id>/stages')
-@login_required
-def get_stages(job_id):
-    """Get interview stages for a specific job."""
+
+def list_job_stages(job_id):
+    """Fetch a job's interview stages as simplified dicts."""
     # First get the job info to find the interview plan
-    job_result = ashby_request('job.info', {'id': job_id})
+    job_result = cached_ashby_request('job.info', {'id': job_id})
 
     if not job_result.get('success'):
-        return jsonify({'error': 'Failed to get job info'}), 400
+        return {'success': False, 'errors': 'Failed to get job info'}
 
     job = job_result.get('results', {})
     interview_plan_id = job.get('defaultInterviewPlanId')
 
     if not interview_plan_id:
-        return jsonify([])
+        return {'success': True, 'results': [], 'stale': job_result.get('stale', False)}
 
     # Get interview stages for this plan
-    stages_result = ashby_request('interviewStage.list', {'interviewPlanId': interview_plan_id})
+    stages_result = cached_ashby_request('interviewStage.list', {'interviewPlanId': interview_plan_id})
+
+    if not stages_result.get('success'):
+        return stages_result
+
+    stages = [{
+        'id': stage.get('id'),
+        'title': stage.get('title'),
+        'type': stage.get('type'),
+        'orderInInterviewPlan': stage.get('orderInInterviewPlan')
+    } for stage in stages_result.get('results', [])]
+    stale = job_result.get('stale', False) or stages_result.get('stale', False)
+    return {'success': True, 'results': stages, 'stale': stale}
+
+
+def json_result(result):
+    """Respond with a result's records, flagging ones served from a stale cache."""
+    if not result.get('success'):
+        return jsonify({'error': result.get('errors', 'Unknown error')}), 400
+    response = jsonify(result['results'])
+    if result.get('stale'):
+        response.headers['X-Stale'] = 'true'
+    return response
+
+
+@app.route('/api/jobs')
+@login_required
+def get_jobs():
+    """Get all jobs from Ashby."""
+    return json_result(list_jobs())
+
 
-    if stages_result.get('success'):
-        stages = stages_result.get('results', [])
-        return jsonify([{
-            'id': stage.get('id'),
-            'title': stage.get('title'),
-            'type': stage.get('type'),
-            'orderInInterviewPlan': stage.get('orderInInterviewPlan')
-        } for stage in stages])
+@app.route('/api/jobs/<job_id>/stages')
+@login_required
+def get_stages(job_id):
+    """Get interview stages for a specific job."""
+    return json_result(list_job_stages(job_id))
 
-    return jsonify({'error': stages_result.get('errors', 'Unknown error')}), 400
+
+@app.route('/api/cache/clear', methods=['POST'])
+@login_required
+def clear_cache():
+    """Drop cached Ashby data so the next requests fetch it fresh."""
+    list_jobs.cache_clear()
+    cached_ashby_request.cache_clear()
+    get_file_info.cache_clear()
+    clear_candidate_listings()
+    with _sync_lock:
+        _sync_states.clear()
+    return jsonify({'success': True})
+
+
+def resume_handle_of(candidate):
+    """Return the resume file handle on a candidate object, if it has one."""
+    resume_handle_obj = candidate.get('resumeFileHandle')
+    if resume_handle_obj:
+        return resume_handle_obj.get('handle')
+    return None
 
 
 def fetch_candidate_resume_handle(candidate_id):
     """Fetch resume file handle for a single candidate."""
     if not candidate_id:
         return None
-    candidate_result = ashby_request('candidate.info', {'id': candidate_id})
+    candidate_result = cached_ashby_request('candidate.info', {'id': candidate_id})
     if candidate_result.get('success'):
-        candidate_full = candidate_result.get('results', {})
-        resume_handle_obj = candidate_full.get('resumeFileHandle')
-        if resume_handle_obj:
-            return resume_handle_obj.get('handle')
+        return resume_handle_of(candidate_result.get('results', {}))
+    return None
+
+
+def list_job_applications(job_id, stage_id=None):
+    """List a job's applications, pushing as much work to Ashby as it accepts.
+
+    Asks Ashby to expand candidate resume handles and, when given, to filter
+    by interview stage. If Ashby rejects the request these optional
+    parameters are dropped one at a time; one found to be rejected is not
+    sent again by this process. Transient failures (server errors, timeouts,
+    exhausted retries) are returned as-is and never blamed on a parameter.
+    """
+    optional_params = {'expand': APPLICATION_LIST_EXPAND}
+    if stage_id:
+        optional_params['interviewStageId'] = stage_id
+    optional_params = {key: value for key, value in optional_params.items()
+                       if key not in _unsupported_application_params}
+
+    dropped = None
+    while True:
+        # Always a full listing: a job- or stage-filtered delta leaves out
+        # applications that have since moved away, so merging it would keep
+        # them with their old job and stage
+        result = ashby_request_paginated('application.list', {'jobId': job_id, **optional_params})
+        if result.get('success'):
+            if dropped:
+                print(f"application.list rejected {dropped}; no longer sending it")
+                _unsupported_application_params.add(dropped)
+            return result
+        if not optional_params or result.get('transient'):
+            return result
+        dropped, _ = optional_params.popitem()
+
+
+def get_candidate_listing(job_id, stage_id):
+    """Return the candidates listed for a job and stage within the TTL, or None."""
+    with _candidate_listings_lock:
+        entry = _candidate_listings.get((job_id, stage_id))
+        if entry and entry[0] > time.monotonic():
+            _candidate_listings.move_to_end((job_id, stage_id))
+            return entry[1]
     return None
 
 
+def store_candidate_listing(job_id, stage_id, candidates):
+    """Remember a finished candidate listing for CANDIDATE_LISTING_TTL seconds."""
+    with _candidate_listings_lock:
+        _candidate_listings[(job_id, stage_id)] = (time.monotonic() + CANDIDATE_LISTING_TTL, candidates)
+        _candidate_listings.move_to_end((job_id, stage_id))
+        while len(_candidate_listings) > CANDIDATE_LISTING_MAXSIZE:
+            _candidate_listings.popitem(last=False)
+
+
+def clear_candidate_listings():
+    """Forget all cached candidate listings."""
+    with _candidate_listings_lock:
+        _candidate_listings.clear()
+
+
+def sse_event(payload):
+    """Encode a payload as a server-sent event."""
+    return b'data: ' + orjson.dumps(payload) + b'\n\n'
+
+
 @app.route('/api/candidates')
 @login_required
 def get_candidates():
@@ -216,84 +774,262 @@ def get_candidates():
         return jsonify({'error': 'Job ID is required'}), 400
 
     def generate():
+        # A recent listing for the same job and stage is sent straight away
+        candidates = get_candidate_listing(job_id, stage_id)
+        if candidates is not None:
+            yield sse_event({'type': 'complete', 'candidates': candidates})
+            return
+
         # Send initial status
-        yield f"data: {json.dumps({'type': 'status', 'message': 'Fetching applications...'})}\n\n"
+        yield sse_event({'type': 'status', 'message': 'Fetching applications...'})
 
-        # Get applications filtered by job (server-side)
-        filter_params = {'jobId': job_id}
-        applications_result = ashby_request_paginated('application.list', filter_params)
+        # Get applications filtered by job and stage (server-side)
+        applications_result = list_job_applications(job_id, stage_id)
 
         if not applications_result.get('success'):
-            yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to get applications'})}\n\n"
+            yield sse_event({'type': 'error', 'message': 'Failed to get applications'})
             return
 
         all_apps = applications_result.get('results', [])
 
-        yield f"data: {json.dumps({'type': 'status', 'message': f'Found {len(all_apps)} applications. Filtering by stage...'})}\n\n"
+        yield sse_event({'type': 'status', 'message': f'Found {len(all_apps)} applications. Filtering by stage...'})
 
-        # Filter by stage (client-side, as Ashby API doesn't support stage filter)
+        # Filter by stage client-side too, in case Ashby ignored or rejected
+        # the stage filter
         if stage_id:
             filtered_apps = [app for app in all_apps
-                            if app.get('currentInterviewStage', {}).get('id') == stage_id]
+                            if (app.get('currentInterviewStage') or _EMPTY).get('id') == stage_id]
         else:
             filtered_apps = all_apps
         total_candidates = len(filtered_apps)
 
-        yield f"data: {json.dumps({'type': 'status', 'message': f'Found {total_candidates} candidates in selected stage. Fetching resume info...'})}\n\n"
+        yield sse_event({'type': 'status', 'message': f'Found {total_candidates} candidates in selected stage. Fetching resumes...'})
 
-        # Build basic candidate info first
+        # Build candidate info, taking resume handles from the expanded
+        # application data and queueing a candidate.info lookup only for
+        # candidates where it is missing
         candidates = []
-        candidate_ids = []
+        pending = []
         for app_data in filtered_apps:
-            candidate_basic = app_data.get('candidate', {})
+            candidate_basic = app_data.get('candidate') or _EMPTY
             candidate_id = candidate_basic.get('id')
-            candidate_ids.append(candidate_id)
+            resume_handle = resume_handle_of(candidate_basic)
+            if resume_handle is None:
+                pending.append((len(candidates), candidate_id))
             candidates.append({
                 'id': candidate_id,
                 'name': candidate_basic.get('name'),
-                'email': candidate_basic.get('primaryEmailAddress', {}).get('value', 'N/A') if candidate_basic.get('primaryEmailAddress') else 'N/A',
+                'email': (candidate_basic.get('primaryEmailAddress') or _EMPTY).get('value', 'N/A'),
                 'applicationId': app_data.get('id'),
-                'stage': app_data.get('currentInterviewStage', {}).get('title', 'N/A') if app_data.get('currentInterviewStage') else 'N/A',
+                'stage': (app_data.get('currentInterviewStage') or _EMPTY).get('title', 'N/A'),
                 'appliedAt': app_data.get('createdAt'),
-                'resumeFileHandle': None
+                'resumeFileHandle': resume_handle
             })
 
-        # Fetch resume handles concurrently with progress tracking
-        if candidate_ids:
+        # Look up the remaining resume handles concurrently with progress tracking
+        if pending:
+            total_pending = len(pending)
+            yield sse_event({'type': 'status', 'message': f'Looking up resumes for {total_pending} of {total_candidates} candidates...'})
             completed_count = 0
-            lock = threading.Lock()
-
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_idx = {
-                    executor.submit(fetch_candidate_resume_handle, cid): idx
-                    for idx, cid in enumerate(candidate_ids)
-                }
-                for future in as_completed(future_to_idx):
-                    idx = future_to_idx[future]
-                    try:
-                        resume_handle = future.result()
-                        candidates[idx]['resumeFileHandle'] = resume_handle
-                    except Exception as e:
-                        print(f"Error fetching candidate {candidate_ids[idx]}: {e}")
-
-                    with lock:
-                        completed_count += 1
-                        if completed_count % 10 == 0 or completed_count == total_candidates:
-                            progress = int((completed_count / total_candidates) * 100)
-                            yield f"data: {json.dumps({'type': 'progress', 'current': completed_count, 'total': total_candidates, 'percent': progress})}\n\n"
+            # Report progress in roughly 5% steps
+            tick = max(1, total_pending // 20)
+            next_tick = tick
+            # Workers hand results over through a queue, so they never wait on
+            # the client reading the stream
+            results = queue.Queue()
+
+            def lookup(idx, cid):
+                try:
+                    resume_handle = fetch_candidate_resume_handle(cid)
+                except Exception as e:
+                    print(f"Error fetching candidate {cid}: {e}")
+                    resume_handle = None
+                results.put((idx, resume_handle))
+
+            # Keep at most RESUME_LOOKUP_WINDOW lookups queued at once, so a
+            # large stage takes turns on the shared pool with other listings
+            # instead of queueing all of its lookups ahead of theirs
+            remaining = iter(pending)
+            futures = []
+
+            def submit_next():
+                item = next(remaining, None)
+                if item is not None:
+                    futures.append(RESUME_LOOKUP_POOL.submit(lookup, *item))
+
+            for _ in range(RESUME_LOOKUP_WINDOW):
+                submit_next()
+
+            try:
+                while completed_count < total_pending:
+                    idx, resume_handle = results.get()
+                    submit_next()
+                    candidates[idx]['resumeFileHandle'] = resume_handle
+                    completed_count += 1
+                    if completed_count >= next_tick or completed_count == total_pending:
+                        next_tick += tick
+                        progress = int((completed_count / total_pending) * 100)
+                        yield sse_event({'type': 'progress', 'current': completed_count, 'total': total_pending, 'percent': progress})
+            finally:
+                # Drop queued lookups if the client went away
+                for future in futures:
+                    future.cancel()
 
         # Send final result
-        yield f"data: {json.dumps({'type': 'complete', 'candidates': candidates})}\n\n"
+        store_candidate_listing(job_id, stage_id, candidates)
+        yield sse_event({'type': 'complete', 'candidates': candidates})
 
     return Response(generate(), mimetype='text/event-stream')
 
 
+def zip_compression_for(data):
+    """Store PDFs as-is (they are compressed internally) and deflate anything else."""
+    if data.startswith(b'%PDF'):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def sanitize_filename(name):
+    """Keep only alphanumerics, spaces, hyphens and underscores."""
+    return _FILENAME_UNSAFE.sub('', name).strip()
+
+
+@ttl_cache(ttl=FILE_INFO_TTL, maxsize=1024, cache_if=succeeded)
+def get_file_info(file_handle):
+    """Get file info (name and presigned URL) for a file handle, cached briefly."""
+    return ashby_request('file.info', {'fileHandle': file_handle})
+
+
+def open_file_download(file_handle, file_url):
+    """Start a streamed download of a file's presigned URL, or return None.
+
+    A 4xx usually means a cached URL has expired, so the handle's file.info
+    entry is dropped and the download retried once with a fresh URL.
+    """
+    response = http_session().get(file_url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+
+    if 400 <= response.status_code < 500:
+        response.close()
+        get_file_info.cache_pop(file_handle)
+        file_result = get_file_info(file_handle)
+        fresh_url = (file_result.get('results') or _EMPTY).get('url') if file_result.get('success') else None
+        if not fresh_url or fresh_url == file_url:
+            return None
+        response = http_session().get(fresh_url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+
+    if response.status_code != 200:
+        response.close()
+        return None
+    # Let reads from the raw stream undo any Content-Encoding
+    response.raw.decode_content = True
+    return response
+
+
+def resolve_resume_file(file_handle):
+    """Look up a resume's (original_filename, url), or None if unavailable."""
+    try:
+        file_result = get_file_info(file_handle)
+
+        if not file_result.get('success'):
+            return None
+
+        file_info = file_result.get('results', {})
+        file_url = file_info.get('url')
+
+        if not file_url:
+            return None
+
+        return file_info.get('name') or 'resume.pdf', file_url
+
+    except Exception as e:
+        print(f"Error getting file info for {file_handle}: {e}")
+        return None
+
+
+def download_to_spool(file_handle, file_url):
+    """Download a file into a SpooledTemporaryFile positioned at the start.
+
+    Large resumes go to disk instead of being held in memory. Returns None
+    if the download fails.
+    """
+    try:
+        response = open_file_download(file_handle, file_url)
+        if response is None:
+            return None
+
+        spool = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE)
+        with response:
+            shutil.copyfileobj(response.raw, spool, DOWNLOAD_CHUNK_SIZE)
+        spool.seek(0)
+        return spool
+
+    except Exception as e:
+        print(f"Error downloading file {file_url}: {e}")
+        return None
+
+
+def iter_bulk_downloads(file_handles):
+    """Download resumes, yielding (index, original_filename, file) in handle order.
+
+    file.info lookups and downloads run on separate pools, and each download
+    starts as soon as its URL is known rather than after the previous
+    resume's lookup and download finish. Work is only started up to
+    BULK_DOWNLOAD_WINDOW handles ahead of the one being yielded, so a slow
+    client doesn't leave every resume waiting in a spool file. Handles that
+    can't be resolved or downloaded are skipped.
+    """
+    lookups = {}
+    downloads = {}
+    pending = set()
+    ready = {}  # index -> (original_filename, file) or None, until its turn
+    next_index = 0
+    next_submit = 0
+
+    try:
+        while next_index < len(file_handles):
+            while next_submit < min(len(file_handles), next_index + BULK_DOWNLOAD_WINDOW):
+                lookup = FILE_INFO_POOL.submit(resolve_resume_file, file_handles[next_submit])
+                lookups[lookup] = next_submit
+                pending.add(lookup)
+                next_submit += 1
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in lookups:
+                    i = lookups.pop(future)
+                    resolved = future.result()
+                    if resolved is None:
+                        ready[i] = None
+                        continue
+                    original_filename, file_url = resolved
+                    download = BULK_DOWNLOAD_POOL.submit(download_to_spool, file_handles[i], file_url)
+                    downloads[download] = (i, original_filename)
+                    pending.add(download)
+                else:
+                    i, original_filename = downloads.pop(future)
+                    spool = future.result()
+                    ready[i] = (original_filename, spool) if spool else None
+
+            while next_index in ready:
+                downloaded = ready.pop(next_index)
+                if downloaded:
+                    yield (next_index, *downloaded)
+                next_index += 1
+    finally:
+        # Client went away: drop queued work and anything already downloaded
+        for future in pending:
+            future.cancel()
+        for downloaded in ready.values():
+            if downloaded:
+                downloaded[1].close()
+
+
 @app.route('/api/download-resume/<file_handle>')
 @login_required
 def download_resume(file_handle):
     """Download a single resume file."""
     # Get file URL from Ashby
-    file_result = ashby_request('file.info', {'fileHandle': file_handle})
+    file_result = get_file_info(file_handle)
 
     if not file_result.get('success'):
         return jsonify({'error': 'Failed to get file info'}), 400
@@ -305,13 +1041,17 @@ def download_resume(file_handle):
     if not file_url:
         return jsonify({'error': 'No file URL available'}), 400
 
-    # Download the file
-    response = requests.get(file_url)
-    if response.status_code != 200:
+    # Stream the file through rather than buffering it
+    try:
+        response = open_file_download(file_handle, file_url)
+    except requests.exceptions.RequestException as e:
+        print(f"Error downloading file {file_url}: {e}")
+        response = None
+    if response is None:
         return jsonify({'error': 'Failed to download file'}), 400
 
     return send_file(
-        io.BytesIO(response.content),
+        response.raw,
         mimetype='application/pdf',
         as_attachment=True,
         download_name=filename
@@ -329,67 +1069,268 @@ def download_bulk():
     if not file_handles:
         return jsonify({'error': 'No file handles provided'}), 400
 
-    # Create a ZIP file in memory
-    zip_buffer = io.BytesIO()
-
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for i, file_handle in enumerate(file_handles):
-            try:
-                # Get file URL from Ashby
-                file_result = ashby_request('file.info', {'fileHandle': file_handle})
+    def generate():
+        # Stream the ZIP as it is built: each entry is flushed to the client
+        # as soon as its resume has been downloaded
+        stream = ZipStreamBuffer()
+
+        # Download concurrently; ZipFile is not thread-safe so entries are
+        # written from this thread, in the order the handles were given
+        with zipfile.ZipFile(stream, 'w') as zip_file:
+            for i, original_filename, spool in iter_bulk_downloads(file_handles):
+                try:
+                    # Create filename with candidate name
+                    candidate_name = candidate_names[i] if i < len(candidate_names) else None
+                    safe_name = sanitize_filename(str(candidate_name or f'candidate_{i}'))
 
-                if not file_result.get('success'):
+                    # Get file extension from original filename
+                    ext = os.path.splitext(str(original_filename))[1] or '.pdf'
+                    filename = f"{safe_name}{ext}"
+                except Exception as e:
+                    # Skip this entry; the archive must still be finished
+                    print(f"Error naming file {file_handles[i]}: {e}")
+                    spool.close()
                     continue
 
-                file_info = file_result.get('results', {})
-                file_url = file_info.get('url')
-                original_filename = file_info.get('name', 'resume.pdf')
+                # Add to ZIP, copying the download across in chunks
+                with spool:
+                    zip_info = zipfile.ZipInfo(filename, date_time=time.localtime()[:6])
+                    zip_info.external_attr = 0o600 << 16
+                    zip_info.compress_type = zip_compression_for(spool.read(4))
+                    zip_info.file_size = spool.seek(0, os.SEEK_END)
+                    spool.seek(0)
+
+                    with zip_file.open(zip_info, 'w') as entry:
+                        while chunk := spool.read(DOWNLOAD_CHUNK_SIZE):
+                            entry.write(chunk)
+                            yield stream.drain()
+                yield stream.drain()
+
+        # Central directory, written when the ZipFile closes
+        yield stream.drain()
+
+    return Response(
+        generate(),
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment; filename="candidate_resumes.zip"'}
+    )
 
-                if not file_url:
-                    continue
 
-                # Download the file
-                response = requests.get(file_url)
-                if response.status_code != 200:
-                    continue
+@app.route('/pdf-combiner')
+@login_required
+def pdf_combiner():
+    """Serve the PDF combiner page."""
+    return render_template('pdf_combiner.html')
 
-                # Create filename with candidate name
-                candidate_name = candidate_names[i] if i < len(candidate_names) else f'candidate_{i}'
-                # Sanitize filename
-                safe_name = "".join(c for c in candidate_name if c.isalnum() or c in (' ', '-', '_')).strip()
 
-                # Get file extension from original filename
-                ext = os.path.splitext(original_filename)[1] or '.pdf'
-                filename = f"{safe_name}{ext}"
+def merge_pdf_batch(batch, output_path):
+    """Merge a batch of {'name', 'path'} PDF items into a PDF at output_path.
 
-                # Add to ZIP
-                zip_file.writestr(filename, response.content)
+    Runs inside a combine job's process, working from paths on disk.
+    """
+    combined = pikepdf.Pdf.new()
 
+    # Sources stay open until the combined PDF is saved, since copied pages
+    # can still refer to their stream data
+    with ExitStack() as sources:
+        for pdf_item in batch:
+            try:
+                source = sources.enter_context(pikepdf.open(pdf_item['path']))
+                combined.pages.extend(source.pages)
             except Exception as e:
-                print(f"Error downloading file {file_handle}: {e}")
+                print(f"Error processing {pdf_item['name']}: {e}")
                 continue
 
-    zip_buffer.seek(0)
+        # Pack objects into compressed object streams to keep the output
+        # small; qpdf doesn't merge fonts the resumes have in common
+        combined.save(
+            output_path,
+            compress_streams=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate
+        )
+    return output_path
 
-    return send_file(
-        zip_buffer,
-        mimetype='application/zip',
-        as_attachment=True,
-        download_name='candidate_resumes.zip'
-    )
 
+def extract_pdfs(zf, pdf_names, work_dir):
+    """Stream each PDF member of zf into work_dir, returning {'name', 'path'} items.
 
-@app.route('/pdf-combiner')
-@login_required
-def pdf_combiner():
-    """Serve the PDF combiner page."""
-    return render_template('pdf_combiner.html')
+    Members that can't be read are skipped.
+    """
+    pdf_items = []
+    for i, pdf_name in enumerate(pdf_names):
+        path = os.path.join(work_dir, f'input_{i}.pdf')
+        try:
+            with zf.open(pdf_name) as src, open(path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, DOWNLOAD_CHUNK_SIZE)
+        except Exception as e:
+            print(f"Error reading {pdf_name}: {e}")
+            continue
+        pdf_items.append({'name': os.path.basename(pdf_name), 'path': path})
+    return pdf_items
+
+
+def open_private(path):
+    """Open a file for writing that only the app's user can read."""
+    return open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb')
+
+
+def make_combine_job_dir(job_id):
+    """Create a private directory for a combine job and return its path.
+
+    Uploaded resumes are candidate data, so COMBINE_JOBS_DIR must belong to
+    the app's user and is kept closed to everyone else.
+    """
+    os.makedirs(COMBINE_JOBS_DIR, mode=0o700, exist_ok=True)
+    if os.stat(COMBINE_JOBS_DIR).st_uid != os.getuid():
+        raise PermissionError(f'{COMBINE_JOBS_DIR} is owned by another user')
+    os.chmod(COMBINE_JOBS_DIR, 0o700)
+    job_dir = os.path.join(COMBINE_JOBS_DIR, job_id)
+    os.mkdir(job_dir, 0o700)
+    return job_dir
+
+
+def write_combine_status(job_dir, status, **fields):
+    """Atomically replace a combine job's status file."""
+    tmp_path = os.path.join(job_dir, 'status.json.tmp')
+    with open_private(tmp_path) as status_file:
+        status_file.write(orjson.dumps({'status': status, **fields}))
+    os.replace(tmp_path, os.path.join(job_dir, 'status.json'))
+
+
+def read_combine_status(job_id):
+    """Return a combine job's directory and status, or (None, None) if unknown."""
+    if not _COMBINE_JOB_ID.fullmatch(job_id):
+        return None, None
+    job_dir = os.path.join(COMBINE_JOBS_DIR, job_id)
+    try:
+        with open(os.path.join(job_dir, 'status.json'), 'rb') as status_file:
+            status = orjson.loads(status_file.read())
+            updated = os.fstat(status_file.fileno()).st_mtime
+    except FileNotFoundError:
+        return None, None
+
+    if status['status'] == 'processing' and updated < time.time() - COMBINE_JOB_STALL_TIMEOUT:
+        status = {'status': 'failed', 'code': 500, 'error': 'Combining stopped responding, please try again'}
+    return job_dir, status
+
+
+def expire_combine_jobs():
+    """Remove combine jobs that have been idle for longer than COMBINE_JOB_TTL."""
+    cutoff = time.time() - COMBINE_JOB_TTL
+    try:
+        entries = list(os.scandir(COMBINE_JOBS_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def keep_combine_job_alive(job_dir, stop):
+    """Touch a running job's status file every COMBINE_JOB_HEARTBEAT seconds until stopped."""
+    while not stop.wait(COMBINE_JOB_HEARTBEAT):
+        try:
+            os.utime(os.path.join(job_dir, 'status.json'))
+        except OSError:
+            pass
+
+
+def run_combine_job(job_dir, pdf_names, pdfs_per_file):
+    """Merge the PDFs of a job's uploaded ZIP into groups, recording progress."""
+    upload_path = os.path.join(job_dir, 'upload.zip')
+    # Everything this job process writes (extracted inputs, merged PDFs, the
+    # result ZIP) is candidate data; keep it owner-only
+    os.umask(0o077)
+
+    # The stall clock starts now, not while the job was queued, and the
+    # heartbeat keeps it fresh through long extractions and merges
+    write_combine_status(job_dir, 'processing', completed=0,
+                         total=math.ceil(len(pdf_names) / pdfs_per_file))
+    stop_heartbeat = threading.Event()
+    threading.Thread(target=keep_combine_job_alive, args=(job_dir, stop_heartbeat), daemon=True).start()
+
+    try:
+        # Inputs and merged outputs live on disk, so memory stays flat no
+        # matter how large the upload is
+        with tempfile.TemporaryDirectory(dir=job_dir) as work_dir:
+            with zipfile.ZipFile(upload_path, 'r') as zf:
+                pdf_items = extract_pdfs(zf, pdf_names, work_dir)
+            os.remove(upload_path)
+
+            if len(pdf_items) == 0:
+                write_combine_status(job_dir, 'failed', code=400,
+                                     error='Could not read any PDF files from the ZIP')
+                return
+
+            # Calculate number of output files
+            num_output_files = math.ceil(len(pdf_items) / pdfs_per_file)
+            write_combine_status(job_dir, 'processing', completed=0, total=num_output_files)
+            jobs = (
+                (pdf_items[start_idx:start_idx + pdfs_per_file],
+                 os.path.join(work_dir, f'combined_{start_idx // pdfs_per_file + 1:03d}.pdf'))
+                for start_idx in range(0, len(pdf_items), pdfs_per_file)
+            )
+
+            # Create output ZIP with combined PDFs; they are already
+            # compressed internally, so they are stored as-is
+            with zipfile.ZipFile(os.path.join(job_dir, 'result.zip'), 'w', zipfile.ZIP_STORED) as output_zip:
+                # Merged one group at a time: the job already has a process
+                # to itself, and COMBINE_JOB_WORKERS caps those host-wide
+                combined_pdfs = (merge_pdf_batch(batch, output_path) for batch, output_path in jobs)
+                for completed, output_path in enumerate(combined_pdfs, 1):
+                    output_zip.write(output_path, os.path.basename(output_path))
+                    # Done with this one; don't hold every group on disk twice
+                    os.remove(output_path)
+                    write_combine_status(job_dir, 'processing', completed=completed, total=num_output_files)
+
+        write_combine_status(job_dir, 'complete', completed=num_output_files, total=num_output_files)
+
+    except Exception as e:
+        print(f"Combine job {os.path.basename(job_dir)} failed: {e}")
+        write_combine_status(job_dir, 'failed', code=500, error=f'Error processing files: {str(e)}')
+
+    finally:
+        stop_heartbeat.set()
+
+
+def new_combine_job_pool():
+    """Create the process pool combine jobs run in."""
+    return ProcessPoolExecutor(max_workers=COMBINE_JOB_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+
+
+def submit_combine_job(job_dir, pdf_names, pdfs_per_file):
+    """Start run_combine_job in the job process pool.
+
+    A job process that dies (e.g. out of memory) breaks the pool; its job is
+    marked failed and the next submission gets a fresh pool.
+    """
+    global _combine_job_pool
+
+    def record_crash(future):
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Combine job {os.path.basename(job_dir)} crashed: {future.exception()}")
+            write_combine_status(job_dir, 'failed', code=500,
+                                 error='Error processing files: the merge process stopped')
+
+    with _combine_job_pool_lock:
+        if _combine_job_pool is None:
+            _combine_job_pool = new_combine_job_pool()
+        try:
+            future = _combine_job_pool.submit(run_combine_job, job_dir, pdf_names, pdfs_per_file)
+        except BrokenProcessPool:
+            _combine_job_pool = new_combine_job_pool()
+            future = _combine_job_pool.submit(run_combine_job, job_dir, pdf_names, pdfs_per_file)
+    future.add_done_callback(record_crash)
 
 
 @app.route('/api/combine-pdfs', methods=['POST'])
 @login_required
 def combine_pdfs():
-    """Combine PDFs from a ZIP file into groups."""
+    """Start combining PDFs from a ZIP file into groups.
+
+    The upload is checked and saved, then merged in the background; the
+    response is 202 with a job id and the URL to poll for its status.
+    """
     if 'zipfile' not in request.files:
         return jsonify({'error': 'No ZIP file provided'}), 400
 
@@ -399,83 +1340,77 @@ def combine_pdfs():
     if pdfs_per_file < 1:
         return jsonify({'error': 'PDFs per file must be at least 1'}), 400
 
+    expire_combine_jobs()
+    job_id = secrets.token_urlsafe(16)
+    job_dir = make_combine_job_dir(job_id)
+
     try:
-        # Read the ZIP file
-        zip_buffer = io.BytesIO(zip_file.read())
-        pdf_files = []
+        upload_path = os.path.join(job_dir, 'upload.zip')
+        with open_private(upload_path) as upload_file:
+            zip_file.save(upload_file)
 
-        with zipfile.ZipFile(zip_buffer, 'r') as zf:
+        with zipfile.ZipFile(upload_path, 'r') as zf:
             # Get all PDF files from the ZIP, sorted by name
             pdf_names = sorted([
                 name for name in zf.namelist()
                 if name.lower().endswith('.pdf') and not name.startswith('__MACOSX')
             ])
 
-            if len(pdf_names) == 0:
-                return jsonify({'error': 'No PDF files found in the ZIP'}), 400
+        if len(pdf_names) == 0:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            return jsonify({'error': 'No PDF files found in the ZIP'}), 400
 
-            # Read all PDF files
-            for pdf_name in pdf_names:
-                try:
-                    pdf_data = zf.read(pdf_name)
-                    pdf_files.append({
-                        'name': os.path.basename(pdf_name),
-                        'data': pdf_data
-                    })
-                except Exception as e:
-                    print(f"Error reading {pdf_name}: {e}")
-                    continue
-
-        if len(pdf_files) == 0:
-            return jsonify({'error': 'Could not read any PDF files from the ZIP'}), 400
-
-        # Calculate number of output files
-        num_output_files = math.ceil(len(pdf_files) / pdfs_per_file)
+        write_combine_status(job_dir, 'queued', completed=0,
+                             total=math.ceil(len(pdf_names) / pdfs_per_file))
+        submit_combine_job(job_dir, pdf_names, pdfs_per_file)
 
-        # Create output ZIP with combined PDFs
-        output_zip_buffer = io.BytesIO()
+    except zipfile.BadZipFile:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return jsonify({'error': 'Invalid ZIP file'}), 400
+    except Exception as e:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return jsonify({'error': f'Error processing files: {str(e)}'}), 500
 
-        with zipfile.ZipFile(output_zip_buffer, 'w', zipfile.ZIP_DEFLATED) as output_zip:
-            for i in range(num_output_files):
-                start_idx = i * pdfs_per_file
-                end_idx = min((i + 1) * pdfs_per_file, len(pdf_files))
-                batch = pdf_files[start_idx:end_idx]
+    return jsonify({
+        'jobId': job_id,
+        'statusUrl': url_for('get_combine_status', job_id=job_id)
+    }), 202
 
-                # Combine PDFs in this batch
-                pdf_writer = PdfWriter()
 
-                for pdf_item in batch:
-                    try:
-                        pdf_reader = PdfReader(io.BytesIO(pdf_item['data']))
-                        for page in pdf_reader.pages:
-                            pdf_writer.add_page(page)
-                    except Exception as e:
-                        print(f"Error processing {pdf_item['name']}: {e}")
-                        continue
+@app.route('/api/combine-pdfs/<job_id>')
+@login_required
+def get_combine_status(job_id):
+    """Report a combine job's progress, with a download URL once complete."""
+    _, status = read_combine_status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
 
-                # Write combined PDF to buffer
-                combined_buffer = io.BytesIO()
-                pdf_writer.write(combined_buffer)
-                combined_buffer.seek(0)
+    if status['status'] == 'failed':
+        return jsonify({'status': 'failed', 'error': status['error']}), status['code']
 
-                # Add to output ZIP
-                output_filename = f"combined_{i + 1:03d}.pdf"
-                output_zip.writestr(output_filename, combined_buffer.read())
+    if status['status'] == 'complete':
+        status['downloadUrl'] = url_for('download_combined_pdfs', job_id=job_id)
+    return jsonify(status)
 
-        output_zip_buffer.seek(0)
 
-        return send_file(
-            output_zip_buffer,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name='combined_pdfs.zip'
-        )
+@app.route('/api/combine-pdfs/<job_id>/result')
+@login_required
+def download_combined_pdfs(job_id):
+    """Download a completed combine job's ZIP."""
+    job_dir, status = read_combine_status(job_id)
+    if status is None or status['status'] != 'complete':
+        return jsonify({'error': 'No combined PDFs for this job'}), 404
 
-    except zipfile.BadZipFile:
-        return jsonify({'error': 'Invalid ZIP file'}), 400
-    except Exception as e:
-        return jsonify({'error': f'Error processing files: {str(e)}'}), 500
+    # Served by path so Werkzeug can answer range requests and use sendfile
+    return send_file(
+        os.path.join(job_dir, 'result.zip'),
+        mimetype='application/zip',
+        as_attachment=True,
+        download_name='combined_pdfs.zip',
+        conditional=True
+    )
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    # Local development only; production runs under gunicorn (see Procfile)
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', port=5000)
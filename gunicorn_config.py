@@ -0,0 +1,13 @@
+import multiprocessing
+import os
+
+# gevent workers serve many concurrent requests each, so long-lived SSE
+# streams and bulk downloads don't tie up a worker per user
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_connections = 1000
+
+# Long enough for large bulk downloads and PDF combines
+timeout = 300
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
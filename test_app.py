@@ -1,6 +1,20 @@
+import io
+import os
+import stat
+import json
+import time
+import threading
+import zipfile
+from collections import OrderedDict
 import pytest
 from unittest.mock import patch, MagicMock
-from app import app, __version__
+import pikepdf
+from app import (
+    app, __version__, ashby_request_paginated, http_session, SESSION, BULK_DOWNLOAD_POOL,
+    ashby_request, get_file_info, list_jobs, cached_ashby_request, sanitize_filename,
+    zip_compression_for, clear_candidate_listings, TokenBucket, parse_retry_after, retry_delay,
+    ASHBY_API_KEY, RETRY_MAX_DELAY, DOWNLOAD_TIMEOUT, keep_combine_job_alive,
+)
 
 
 @pytest.fixture
@@ -8,6 +22,10 @@ def client():
     """Create a test client."""
     app.config['TESTING'] = True
     app.config['SECRET_KEY'] = 'test-secret-key'
+    list_jobs.cache_clear()
+    cached_ashby_request.cache_clear()
+    get_file_info.cache_clear()
+    clear_candidate_listings()
     with app.test_client() as client:
         yield client
 
@@ -53,6 +71,15 @@ class TestAuthentication:
         response = authenticated_client.get('/')
         assert response.status_code == 200
 
+    def test_session_round_trips_tagged_values(self, client):
+        """Test that the session cookie keeps tuples and bytes through the JSON provider."""
+        with client.session_transaction() as sess:
+            sess['pair'] = (1, 2)
+            sess['raw'] = b'ab'
+        with client.session_transaction() as sess:
+            assert sess['pair'] == (1, 2)
+            assert sess['raw'] == b'ab'
+
     def test_logout(self, authenticated_client):
         """Test logout clears session."""
         response = authenticated_client.get('/logout')
@@ -113,10 +140,406 @@ class TestAPIEndpoints:
         assert len(data) == 1
         assert data[0]['title'] == 'Application Review'
 
+    @patch('app.ashby_request_paginated')
+    def test_jobs_are_cached_until_cleared(self, mock_ashby, authenticated_client):
+        """Test that /api/jobs reuses the job list until the cache is cleared."""
+        mock_ashby.return_value = {'success': True, 'results': [{'id': 'job-1', 'title': 'Engineer'}]}
+        authenticated_client.get('/api/jobs')
+        authenticated_client.get('/api/jobs')
+        assert mock_ashby.call_count == 1
+
+        response = authenticated_client.post('/api/cache/clear')
+        assert response.status_code == 200
+        authenticated_client.get('/api/jobs')
+        assert mock_ashby.call_count == 2
+
+    @patch('app.ashby_request')
+    def test_stages_served_stale_when_ashby_fails(self, mock_ashby, authenticated_client):
+        """Test that an expired cached response is served, flagged, if Ashby errors."""
+        mock_ashby.side_effect = [
+            {'success': True, 'results': {'defaultInterviewPlanId': 'plan-1'}},
+            {'success': True, 'results': [{'id': 'stage-1', 'title': 'Application Review'}]},
+            {'success': False, 'errors': 'unavailable'},
+            {'success': False, 'errors': 'unavailable'}
+        ]
+        assert 'X-Stale' not in authenticated_client.get('/api/jobs/job-1/stages').headers
+
+        with patch('app.time.monotonic', return_value=time.monotonic() + 3600):
+            response = authenticated_client.get('/api/jobs/job-1/stages')
+        assert response.status_code == 200
+        assert response.headers['X-Stale'] == 'true'
+        assert response.get_json()[0]['title'] == 'Application Review'
+
+
+def make_pdf(pages=1):
+    """Build a small PDF with blank pages."""
+    pdf = pikepdf.Pdf.new()
+    for _ in range(pages):
+        pdf.add_blank_page(page_size=(612, 792))
+    buffer = io.BytesIO()
+    pdf.save(buffer)
+    return buffer.getvalue()
+
+
+def read_events(response):
+    """Parse the JSON payloads out of a server-sent events response."""
+    return [json.loads(line[len('data: '):])
+            for line in response.get_data(as_text=True).splitlines()
+            if line.startswith('data: ')]
+
+
+class TestCandidates:
+    """Test the candidate listing stream."""
+
+    @patch('app._unsupported_application_params', new_callable=set)
+    @patch('app.fetch_candidate_resume_handle')
+    @patch('app.ashby_request_paginated')
+    def test_rejected_params_fall_back_to_lookups(self, mock_paginated, mock_fetch, mock_unsupported,
+                                                  authenticated_client):
+        """Test that rejected filters are dropped and handles looked up individually."""
+        mock_paginated.side_effect = [
+            {'success': False, 'errors': 'invalid parameter'},
+            {'success': False, 'errors': 'invalid parameter'},
+            {'success': True, 'results': [
+                {'id': 'app-1', 'candidate': {'id': 'cand-1', 'name': 'Ada'},
+                 'currentInterviewStage': {'id': 'stage-1', 'title': 'Application Review'}},
+                {'id': 'app-2', 'candidate': {'id': 'cand-2', 'name': 'Alan'},
+                 'currentInterviewStage': {'id': 'stage-2', 'title': 'Phone Screen'}}
+            ]}
+        ]
+        mock_fetch.return_value = 'handle-1'
+        response = authenticated_client.get('/api/candidates?jobId=job-1&stageId=stage-1')
+        events = read_events(response)
+        assert events[-1]['type'] == 'complete'
+        assert [c['id'] for c in events[-1]['candidates']] == ['cand-1']
+        assert events[-1]['candidates'][0]['resumeFileHandle'] == 'handle-1'
+        assert mock_paginated.call_args_list[0].args[1]['interviewStageId'] == 'stage-1'
+        assert mock_paginated.call_args.args[1] == {'jobId': 'job-1'}
+        assert mock_unsupported == {'expand'}
+        mock_fetch.assert_called_once_with('cand-1')
+
+    @patch('app.fetch_candidate_resume_handle')
+    @patch('app.ashby_request_paginated')
+    def test_lookups_beyond_window_all_complete(self, mock_paginated, mock_fetch, authenticated_client):
+        """Test that lookups queued a window at a time still cover every candidate."""
+        mock_paginated.return_value = {'success': True, 'results': [
+            {'id': f'app-{i}', 'candidate': {'id': f'cand-{i}'}} for i in range(45)
+        ]}
+        mock_fetch.side_effect = lambda cid: f'handle-{cid}'
+        events = read_events(authenticated_client.get('/api/candidates?jobId=job-1'))
+        handles = [c['resumeFileHandle'] for c in events[-1]['candidates']]
+        assert handles == [f'handle-cand-{i}' for i in range(45)]
+
+    @patch('app._unsupported_application_params', new_callable=set)
+    @patch('app.ashby_request_paginated')
+    def test_transient_failure_keeps_params(self, mock_paginated, mock_unsupported, authenticated_client):
+        """Test that a transient Ashby failure isn't taken as a rejected parameter."""
+        mock_paginated.return_value = {'success': False, 'errors': 'Server error from API (503)', 'transient': True}
+        events = read_events(authenticated_client.get('/api/candidates?jobId=job-1&stageId=stage-1'))
+        assert events[-1]['type'] == 'error'
+        assert mock_paginated.call_count == 1
+        assert mock_unsupported == set()
+
+    @patch('app.list_job_applications')
+    def test_listing_is_cached_per_stage(self, mock_list, authenticated_client):
+        """Test that a recent listing for the same job and stage is sent immediately."""
+        mock_list.return_value = {'success': True, 'results': [
+            {'id': 'app-1', 'candidate': {'id': 'cand-1', 'name': 'Ada',
+                                          'resumeFileHandle': {'handle': 'stub-handle'}},
+             'currentInterviewStage': {'id': 'stage-1', 'title': 'Application Review'}}
+        ]}
+        read_events(authenticated_client.get('/api/candidates?jobId=job-1&stageId=stage-1'))
+        events = read_events(authenticated_client.get('/api/candidates?jobId=job-1&stageId=stage-1'))
+        assert [e['type'] for e in events] == ['complete']
+        assert events[0]['candidates'][0]['resumeFileHandle'] == 'stub-handle'
+        assert mock_list.call_count == 1
+
+        read_events(authenticated_client.get('/api/candidates?jobId=job-1'))
+        assert mock_list.call_count == 2
+
+    @patch('app.fetch_candidate_resume_handle')
+    @patch('app.ashby_request_paginated')
+    def test_stub_resume_handles_skip_lookups(self, mock_paginated, mock_fetch, authenticated_client):
+        """Test that candidate.info is only called for stubs without a resume handle."""
+        mock_paginated.return_value = {'success': True, 'results': [
+            {'id': 'app-1', 'candidate': {'id': 'cand-1', 'name': 'Ada',
+                                          'resumeFileHandle': {'handle': 'stub-handle'}}},
+            {'id': 'app-2', 'candidate': {'id': 'cand-2', 'name': 'Alan'}}
+        ]}
+        mock_fetch.return_value = 'looked-up-handle'
+        events = read_events(authenticated_client.get('/api/candidates?jobId=job-1'))
+        handles = [c['resumeFileHandle'] for c in events[-1]['candidates']]
+        assert handles == ['stub-handle', 'looked-up-handle']
+        mock_fetch.assert_called_once_with('cand-2')
+        progress = [e for e in events if e['type'] == 'progress']
+        assert progress[-1]['total'] == 1
+
+
+class TestAshbyRequest:
+    """Test the Ashby API client helpers."""
+
+    @patch('app.http_session')
+    def test_uses_pooled_session(self, mock_http_session):
+        """Test that Ashby calls go through the thread's pooled session."""
+        mock_session = mock_http_session.return_value
+        mock_session.post.return_value = MagicMock(
+            status_code=200, text='{"success": true}',
+            json=MagicMock(return_value={'success': True})
+        )
+        result = ashby_request('job.list')
+        assert result == {'success': True}
+        mock_session.post.assert_called_once()
+        assert mock_session.post.call_args.kwargs['auth'] == (ASHBY_API_KEY, '')
+
+    def test_parse_retry_after(self):
+        """Test Retry-After parsing for seconds, HTTP-dates and junk."""
+        assert parse_retry_after('7') == 7
+        assert parse_retry_after(None) == 0
+        assert parse_retry_after('not a date') == 0
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+
+    def test_retry_delay_honors_retry_after(self):
+        """Test backoff never undercuts Retry-After and stays capped."""
+        delays = [retry_delay(0, retry_after=5) for _ in range(100)]
+        assert all(5 <= delay <= 7.5 for delay in delays)
+        # Workers sharing a Retry-After still spread out
+        assert len(set(delays)) > 1
+        assert retry_delay(20) == RETRY_MAX_DELAY
+
+    @patch('app.time.sleep')
+    @patch('app.http_session')
+    def test_retries_after_rate_limit(self, mock_http_session, mock_sleep):
+        """Test that a 429 is retried after a backoff sleep."""
+        mock_session = mock_http_session.return_value
+        limited = MagicMock(status_code=429, headers={'Retry-After': '1'})
+        ok = MagicMock(status_code=200, text='{}', json=MagicMock(return_value={'success': True}))
+        mock_session.post.side_effect = [limited, ok]
+        assert ashby_request('job.list') == {'success': True}
+        assert mock_sleep.call_args.args[0] >= 1
+
+    @patch('app.time.sleep')
+    @patch('app.http_session')
+    def test_exhausted_rate_limit_returns_without_sleeping(self, mock_http_session, mock_sleep):
+        """Test that the last 429 is reported straight away as a transient failure."""
+        limited = MagicMock(status_code=429, headers={'Retry-After': '1'})
+        mock_http_session.return_value.post.return_value = limited
+        result = ashby_request('job.list', retries=3)
+        assert result['success'] is False and result['transient'] is True
+        assert mock_sleep.call_count == 2
+
+    @patch('app.time.sleep')
+    @patch('app.http_session')
+    def test_server_errors_are_retried(self, mock_http_session, mock_sleep):
+        """Test that a 5xx is retried and a persistent one reported."""
+        failing = MagicMock(status_code=503, headers={}, text='unavailable')
+        ok = MagicMock(status_code=200, text='{}', json=MagicMock(return_value={'success': True}))
+        mock_http_session.return_value.post.side_effect = [failing, ok]
+        assert ashby_request('job.list') == {'success': True}
+
+        mock_http_session.return_value.post.side_effect = [failing] * 3
+        result = ashby_request('job.list')
+        assert result['success'] is False
+        assert '503' in result['errors']
+
+
+class TestPagination:
+    """Test paginated and incremental list syncs."""
+
+    @patch('app._sync_states', new_callable=OrderedDict)
+    @patch('app.ashby_request')
+    def test_incremental_sync_merges_changes(self, mock_ashby, mock_states):
+        """Test that a second sync sends the token and merges changed records by id."""
+        mock_ashby.side_effect = [
+            {'success': True, 'results': [{'id': 'a', 'v': 1}, {'id': 'b', 'v': 1}], 'syncToken': 't1'},
+            {'success': True, 'results': [{'id': 'b', 'v': 2}], 'syncToken': 't2'}
+        ]
+        ashby_request_paginated('job.list', incremental=True)
+        result = ashby_request_paginated('job.list', incremental=True)
+        assert mock_ashby.call_args.args[1] == {'syncToken': 't1'}
+        assert result['results'] == [{'id': 'a', 'v': 1}, {'id': 'b', 'v': 2}]
+
+    @patch('app._sync_states', new_callable=OrderedDict)
+    @patch('app.ashby_request')
+    def test_rejected_sync_token_falls_back_to_full_sync(self, mock_ashby, mock_states):
+        """Test that a failed delta sync is retried as a full sync."""
+        mock_ashby.side_effect = [
+            {'success': True, 'results': [{'id': 'a'}], 'syncToken': 't1'},
+            {'success': False, 'errors': ['sync_token_expired']},
+            {'success': True, 'results': [{'id': 'c'}], 'syncToken': 't2'}
+        ]
+        ashby_request_paginated('job.list', incremental=True)
+        result = ashby_request_paginated('job.list', incremental=True)
+        assert mock_ashby.call_args.args[1] == {}
+        assert result['results'] == [{'id': 'c'}]
+
+    @patch('app._sync_states', new_callable=OrderedDict)
+    @patch('app.ashby_request')
+    def test_cache_clear_drops_sync_state(self, mock_ashby, mock_states, authenticated_client):
+        """Test that clearing the cache makes the next sync a full one."""
+        mock_ashby.return_value = {'success': True, 'results': [{'id': 'a'}], 'syncToken': 't1'}
+        ashby_request_paginated('job.list', incremental=True)
+        authenticated_client.post('/api/cache/clear')
+        ashby_request_paginated('job.list', incremental=True)
+        assert mock_ashby.call_args.args[1] == {}
+
+
+class TestTokenBucket:
+    """Test the adaptive rate limiter."""
+
+    @patch('app.time.sleep')
+    def test_acquire_waits_only_when_empty(self, mock_sleep):
+        """Test that tokens are handed out without sleeping while available."""
+        bucket = TokenBucket(capacity=2, max_rate=1000)
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+    def test_aimd_rate_adjustment(self):
+        """Test that throttling halves the rate and successes restore it."""
+        bucket = TokenBucket(capacity=1, max_rate=10, increase_step=5, increase_after=2)
+        bucket.on_throttled()
+        assert bucket.refill_rate == 5
+        bucket.on_success()
+        bucket.on_success()
+        assert bucket.refill_rate == 10
+        bucket.on_success()
+        bucket.on_success()
+        assert bucket.refill_rate == 10
+
+    def test_simultaneous_throttles_halve_once(self):
+        """Test that a burst of 429s from concurrent workers halves the rate once."""
+        bucket = TokenBucket(capacity=1, max_rate=20)
+        for _ in range(20):
+            bucket.on_throttled()
+        assert bucket.refill_rate == 10
+        with patch('app.time.monotonic', return_value=time.monotonic() + 1.5):
+            bucket.on_throttled()
+        assert bucket.refill_rate == 5
+
+
+class TestDownloads:
+    """Test resume download endpoints."""
+
+    @patch('app.http_session')
+    @patch('app.ashby_request')
+    def test_bulk_download_preserves_order(self, mock_ashby, mock_http_session, authenticated_client):
+        """Test bulk ZIP contains one entry per resume, in request order."""
+        mock_session = mock_http_session.return_value
+        get_file_info.cache_clear()
+        mock_ashby.side_effect = lambda endpoint, data: {
+            'success': True,
+            'results': {'url': f"https://files/{data['fileHandle']}", 'name': 'cv.pdf'}
+        }
+        mock_session.get.side_effect = lambda url, **kwargs: MagicMock(status_code=200, raw=io.BytesIO(url.encode()))
+        response = authenticated_client.post('/api/download-bulk', json={
+            'fileHandles': ['h1', 'h2'],
+            'candidateNames': ['Ada Lovelace', 'Alan/Turing']
+        })
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            assert zf.namelist() == ['Ada Lovelace.pdf', 'AlanTuring.pdf']
+            assert zf.read('AlanTuring.pdf') == b'https://files/h2'
+
+    @patch('app.http_session')
+    @patch('app.ashby_request')
+    def test_single_download_streams_file(self, mock_ashby, mock_http_session, authenticated_client):
+        """Test that a single resume is streamed through with its filename."""
+        mock_session = mock_http_session.return_value
+        mock_ashby.return_value = {'success': True, 'results': {'url': 'https://files/h1', 'name': 'cv.pdf'}}
+        mock_session.get.return_value = MagicMock(status_code=200, raw=io.BytesIO(b'%PDF-1.7'))
+        response = authenticated_client.get('/api/download-resume/h1')
+        assert response.status_code == 200
+        assert response.data == b'%PDF-1.7'
+        assert 'cv.pdf' in response.headers['Content-Disposition']
+        assert mock_session.get.call_args.kwargs['stream'] is True
+        assert mock_session.get.call_args.kwargs['timeout'] == DOWNLOAD_TIMEOUT
+
+    @patch('app.http_session')
+    @patch('app.ashby_request')
+    def test_rejected_cached_url_is_refreshed(self, mock_ashby, mock_http_session, authenticated_client):
+        """Test that a 4xx on a cached URL evicts it and retries with a fresh one."""
+        mock_ashby.side_effect = [
+            {'success': True, 'results': {'url': 'https://files/expired', 'name': 'cv.pdf'}},
+            {'success': True, 'results': {'url': 'https://files/fresh', 'name': 'cv.pdf'}}
+        ]
+        mock_http_session.return_value.get.side_effect = lambda url, **kwargs: (
+            MagicMock(status_code=403) if url.endswith('expired') else
+            MagicMock(status_code=200, raw=io.BytesIO(b'%PDF-1.7')))
+        response = authenticated_client.get('/api/download-resume/h1')
+        assert response.status_code == 200
+        assert response.data == b'%PDF-1.7'
+        assert mock_ashby.call_count == 2
+
+    def test_zip_compression_for(self):
+        """Test that PDFs are stored and other files deflated."""
+        assert zip_compression_for(b'%PDF-1.7 ...') == zipfile.ZIP_STORED
+        assert zip_compression_for(b'PK\x03\x04') == zipfile.ZIP_DEFLATED
+
+    def test_pool_workers_get_their_own_session(self):
+        """Test that fan-out workers don't share the request thread's session."""
+        worker_session = BULK_DOWNLOAD_POOL.submit(http_session).result()
+        assert worker_session is not SESSION
+        assert http_session() is SESSION
+
+    @patch('app.BULK_DOWNLOAD_WINDOW', 1)
+    @patch('app.http_session')
+    @patch('app.ashby_request')
+    def test_bulk_download_skips_unresolved_handles(self, mock_ashby, mock_http_session, authenticated_client):
+        """Test that handles without file info are left out without shifting names."""
+        mock_ashby.side_effect = lambda endpoint, data: (
+            {'success': False, 'errors': 'not found'} if data['fileHandle'] == 'h2' else
+            {'success': True, 'results': {'url': f"https://files/{data['fileHandle']}", 'name': 'cv.docx'}}
+        )
+        mock_http_session.return_value.get.side_effect = (
+            lambda url, **kwargs: MagicMock(status_code=200, raw=io.BytesIO(url.encode())))
+        response = authenticated_client.post('/api/download-bulk', json={
+            'fileHandles': ['h1', 'h2', 'h3'],
+            'candidateNames': ['Ada', 'Alan', 'Grace']
+        })
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            assert zf.namelist() == ['Ada.docx', 'Grace.docx']
+            assert zf.read('Grace.docx') == b'https://files/h3'
+
+    @patch('app.http_session')
+    @patch('app.ashby_request')
+    def test_bulk_download_tolerates_missing_names(self, mock_ashby, mock_http_session, authenticated_client):
+        """Test that null candidate or file names fall back instead of breaking the ZIP."""
+        mock_ashby.side_effect = lambda endpoint, data: (
+            {'success': True, 'results': {'url': f"https://files/{data['fileHandle']}", 'name': None}}
+        )
+        mock_http_session.return_value.get.side_effect = (
+            lambda url, **kwargs: MagicMock(status_code=200, raw=io.BytesIO(url.encode())))
+        response = authenticated_client.post('/api/download-bulk', json={
+            'fileHandles': ['h1', 'h2'],
+            'candidateNames': ['Ada', None]
+        })
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            assert zf.namelist() == ['Ada.pdf', 'candidate_1.pdf']
+
+    def test_sanitize_filename(self):
+        """Test that unsafe characters are dropped from ZIP entry names."""
+        assert sanitize_filename(' Ada/Lovelace: CV ') == 'AdaLovelace CV'
+        assert sanitize_filename('José Ramírez-Ruiz') == 'José Ramírez-Ruiz'
+
+    @patch('app.ashby_request')
+    def test_file_info_is_cached(self, mock_ashby):
+        """Test that successful file.info lookups are reused."""
+        get_file_info.cache_clear()
+        mock_ashby.return_value = {'success': True, 'results': {'url': 'https://files/h1'}}
+        get_file_info('h1')
+        get_file_info('h1')
+        assert mock_ashby.call_count == 1
+
 
 class TestPDFCombiner:
     """Test PDF combiner functionality."""
 
+    @pytest.fixture(autouse=True)
+    def jobs_dir(self, tmp_path):
+        """Keep combine jobs out of the system temp dir."""
+        with patch('app.COMBINE_JOBS_DIR', str(tmp_path / 'jobs')):
+            yield tmp_path / 'jobs'
+
     def test_combine_requires_auth(self, client):
         """Test that PDF combiner requires authentication."""
         response = client.post('/api/combine-pdfs')
@@ -127,6 +550,115 @@ class TestPDFCombiner:
         response = authenticated_client.post('/api/combine-pdfs')
         assert response.status_code == 400
 
+    def wait_for_job(self, client, status_url, timeout=30):
+        """Poll a combine job until it is no longer queued or processing."""
+        deadline = time.monotonic() + timeout
+        while True:
+            response = client.get(status_url)
+            if response.get_json().get('status') not in ('queued', 'processing') or time.monotonic() > deadline:
+                return response
+            time.sleep(0.05)
+
+    def test_combine_groups_pdfs(self, authenticated_client, jobs_dir):
+        """Test that PDFs are merged in the background into groups of the requested size."""
+        upload = io.BytesIO()
+        with zipfile.ZipFile(upload, 'w') as zf:
+            for name in ['b.pdf', 'a.pdf', 'c.pdf']:
+                zf.writestr(f'resumes/{name}', make_pdf())
+        upload.seek(0)
+        response = authenticated_client.post('/api/combine-pdfs', data={
+            'zipfile': (upload, 'resumes.zip'),
+            'pdfsPerFile': '2'
+        })
+        assert response.status_code == 202
+        response_job_id = response.get_json()['jobId']
+
+        status = self.wait_for_job(authenticated_client, response.get_json()['statusUrl']).get_json()
+        assert status['status'] == 'complete'
+        assert status['completed'] == status['total'] == 2
+
+        # Candidate data is kept private to the app's user
+        job_dir = jobs_dir / response_job_id
+        assert stat.S_IMODE(jobs_dir.stat().st_mode) == 0o700
+        assert stat.S_IMODE(job_dir.stat().st_mode) == 0o700
+        for path in job_dir.iterdir():
+            assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+        response = authenticated_client.get(status['downloadUrl'])
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            assert zf.namelist() == ['combined_001.pdf', 'combined_002.pdf']
+            assert len(pikepdf.open(io.BytesIO(zf.read('combined_001.pdf'))).pages) == 2
+            assert len(pikepdf.open(io.BytesIO(zf.read('combined_002.pdf'))).pages) == 1
+
+    def test_combine_rejects_invalid_zip(self, authenticated_client):
+        """Test that an invalid upload is rejected before a job is started."""
+        response = authenticated_client.post('/api/combine-pdfs', data={
+            'zipfile': (io.BytesIO(b'not a zip'), 'resumes.zip')
+        })
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Invalid ZIP file'
+
+    def test_combine_reports_unreadable_pdfs(self, authenticated_client):
+        """Test that a job whose PDFs can't be read reports the failure."""
+        upload = io.BytesIO()
+        with zipfile.ZipFile(upload, 'w') as zf:
+            zf.writestr('a.pdf', make_pdf())
+        # Corrupt the member's data so reading it fails its CRC check
+        data = bytearray(upload.getvalue())
+        data[data.index(b'%PDF') + 1] ^= 0xFF
+        response = authenticated_client.post('/api/combine-pdfs', data={
+            'zipfile': (io.BytesIO(bytes(data)), 'resumes.zip')
+        })
+        response = self.wait_for_job(authenticated_client, response.get_json()['statusUrl'])
+        assert response.status_code == 400
+        assert response.get_json()['status'] == 'failed'
+
+    def test_stalled_combine_job_is_reported_failed(self, authenticated_client, jobs_dir):
+        """Test that a job whose status stopped changing is reported as failed."""
+        job_id = 'j' * 22
+        (jobs_dir / job_id).mkdir(parents=True)
+        status_path = jobs_dir / job_id / 'status.json'
+        status_path.write_bytes(json.dumps({'status': 'processing', 'completed': 0, 'total': 1}).encode())
+        assert authenticated_client.get(f'/api/combine-pdfs/{job_id}').status_code == 200
+        stalled = time.time() - 3600
+        os.utime(status_path, (stalled, stalled))
+        response = authenticated_client.get(f'/api/combine-pdfs/{job_id}')
+        assert response.status_code == 500
+        assert response.get_json()['status'] == 'failed'
+
+    def test_queued_combine_job_is_not_stalled(self, authenticated_client, jobs_dir):
+        """Test that a job waiting for a job process isn't reported as stalled."""
+        job_id = 'q' * 22
+        (jobs_dir / job_id).mkdir(parents=True)
+        status_path = jobs_dir / job_id / 'status.json'
+        status_path.write_bytes(json.dumps({'status': 'queued', 'completed': 0, 'total': 1}).encode())
+        stalled = time.time() - 3600
+        os.utime(status_path, (stalled, stalled))
+        response = authenticated_client.get(f'/api/combine-pdfs/{job_id}')
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'queued'
+
+    @patch('app.COMBINE_JOB_HEARTBEAT', 0.01)
+    def test_running_job_heartbeat_touches_status(self, tmp_path):
+        """Test that a running job keeps its status file fresh."""
+        status_path = tmp_path / 'status.json'
+        status_path.write_bytes(b'{}')
+        stalled = time.time() - 3600
+        os.utime(status_path, (stalled, stalled))
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=keep_combine_job_alive, args=(str(tmp_path), stop))
+        heartbeat.start()
+        time.sleep(0.1)
+        stop.set()
+        heartbeat.join()
+        assert status_path.stat().st_mtime > time.time() - 60
+
+    def test_unknown_combine_job(self, authenticated_client):
+        """Test that unknown job ids are not found."""
+        assert authenticated_client.get('/api/combine-pdfs/' + 'x' * 22).status_code == 404
+        assert authenticated_client.get('/api/combine-pdfs/../../etc/result').status_code == 404
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
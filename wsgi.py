@@ -0,0 +1,11 @@
+"""Production entrypoint: patch the stdlib for gevent before the app imports it."""
+import os
+
+# Only under gevent workers (gunicorn_config.py's default); sync or gthread
+# workers must keep the real threading module
+if os.getenv('GUNICORN_WORKER_CLASS', 'gevent') == 'gevent':
+    from gevent import monkey
+
+    monkey.patch_all()
+
+from app import app  # noqa: E402,F401